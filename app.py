@@ -1,12 +1,9 @@
 import pandas as pd
 
-# Load your exported CSV
-df = pd.read_csv("transactions.csv")
+# Load your exported CSV, parsing only the useful columns
+df = pd.read_csv("transactions.csv", usecols=["Date", "Description", "Amount", "Category", "Card", "Note"])
 
 # --- STEP 1: Clean up / simplify ---
-# Keep only useful columns
-df = df[["Date", "Description", "Amount", "Category", "Card", "Note"]]
-
 # Example: Combine Description + Note into one field
 df["Details"] = df["Description"].astype(str) + " " + df["Note"].fillna("")
 
@@ -3,6 +3,7 @@
 
 from pathlib import Path
 import json
+from typing import Optional
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
@@ -17,13 +18,32 @@ SCOPES = [
 CLIENT_SECRET_FILE = "client_secret.json"
 TOKEN_FILE = Path("token.json")
 
+# Credentials reused across calls, with the token file mtime they were loaded/saved at
+_CREDS_CACHE: Optional[Credentials] = None
+_CREDS_MTIME: Optional[float] = None
+
+
+def _token_mtime() -> Optional[float]:
+    """Modification time of the token file, or None if it does not exist."""
+    try:
+        return TOKEN_FILE.stat().st_mtime
+    except OSError:
+        return None
+
 
 def get_credentials():
     """Get valid Google API credentials with refresh capability."""
-    creds = None
+    global _CREDS_CACHE, _CREDS_MTIME
+    
+    # Reuse in-memory credentials unless they expired or the token file was rotated
+    token_mtime = _token_mtime()
+    if _CREDS_CACHE and _CREDS_CACHE.valid and token_mtime == _CREDS_MTIME:
+        return _CREDS_CACHE
+    
+    creds = _CREDS_CACHE if token_mtime == _CREDS_MTIME else None
     
     # Load existing token
-    if TOKEN_FILE.exists():
+    if not creds and token_mtime is not None:
         try:
             creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
         except Exception as e:
@@ -32,6 +52,8 @@ def get_credentials():
     
     # Refresh or get new credentials
     if not creds or not creds.valid:
+        previous = (creds.token, creds.expiry) if creds else None
+        
         if creds and creds.expired and creds.refresh_token:
             try:
                 creds.refresh(Request())
@@ -56,14 +78,17 @@ def get_credentials():
                 print(f"Error during OAuth flow: {e}")
                 raise
         
-        # Save credentials for next time
-        try:
-            with TOKEN_FILE.open("w") as token:
-                token.write(creds.to_json())
-            print("✅ Saved credentials for future use")
-        except Exception as e:
-            print(f"Warning: Could not save credentials: {e}")
+        # Save credentials for next time, skipping the write if nothing changed
+        if (creds.token, creds.expiry) != previous:
+            try:
+                with TOKEN_FILE.open("w") as token:
+                    token.write(creds.to_json())
+                print("✅ Saved credentials for future use")
+            except Exception as e:
+                print(f"Warning: Could not save credentials: {e}")
     
+    _CREDS_CACHE = creds
+    _CREDS_MTIME = _token_mtime()
     return creds
 
 
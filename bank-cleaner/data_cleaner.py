@@ -1,33 +1,103 @@
 # data_cleaner.py
 """Data cleaning utilities for banking CSV files."""
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
 
+# Auto-categorization keywords, checked in priority order
+EBAY_KEYWORDS = ['ebay']
+INCOME_PATTERNS = ['salary', 'wage', 'deposit', 'transfer in', 'refund']
+EXPENSE_CATEGORIES = {
+    'Grocery': ['grocery', 'supermarket', 'food', 'walmart', 'target'],
+    'Gas': ['gas', 'fuel', 'petrol', 'shell', 'bp', 'chevron'],
+    'Utilities': ['electric', 'gas bill', 'water', 'internet', 'phone'],
+    'Dining': ['restaurant', 'cafe', 'pizza', 'mcdonald', 'starbucks'],
+    'Shopping': ['amazon', 'store', 'retail', 'purchase']
+}
+
+_CATEGORY_KEYWORDS = [('eBay', EBAY_KEYWORDS), ('Income', INCOME_PATTERNS)] + list(EXPENSE_CATEGORIES.items())
+
+# One alternation per category
+_CATEGORY_RES = {
+    category: re.compile('|'.join(re.escape(k) for k in keywords))
+    for category, keywords in _CATEGORY_KEYWORDS
+}
+
+# Extra columns appended to the description, first match wins
+NOTE_COLUMNS = ['Note', 'note', 'Notes', 'Memo', 'memo', 'Reference', 'ref']
+
+# Date formats tried when detecting a column's format (month-first before day-first,
+# matching dayfirst=False)
+DATE_FORMATS = [
+    '%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%m/%d/%y', '%d/%m/%y',
+    '%Y/%m/%d', '%d.%m.%Y', '%Y-%m-%d %H:%M:%S', '%d %b %Y', '%b %d, %Y'
+]
+
+# Output file names for each dataset
+DATASET_FILES = {
+    'master': 'cleaned_master.csv',
+    'incoming': 'incoming_payments.csv',
+    'outgoing': 'outgoing_payments.csv',
+    'ebay': 'ebay_outgoing.csv'
+}
+
+# Currency symbols and thousands separators removed from amounts
+CURRENCY_SYMBOLS = ['$', '£', '€', '¥', ',']
+
+# Parentheses notation or a trailing negative sign; kept as a pattern string so
+# Arrow-backed strings run it through pyarrow's regex kernel
+_NEGATIVE_PATTERN = r'\((.*)\)|(\d+\.?\d*)-$'
+
+
 def preview_csv(path: Path, n: int = 5) -> pd.DataFrame:
-    """Load and preview CSV file with column detection."""
-    df = pd.read_csv(path)
+    """Preview the first n rows of a CSV file for column detection.
+    
+    Only the head is parsed; use load_full_csv once the column mapping is known.
+    """
+    df = pd.read_csv(path, nrows=n)
     print(f"\nDetected columns: {list(df.columns)}")
     print(f"\nSample rows:")
     print(df.head(n).to_string(index=False))
     return df
 
 
-def find_default_column(columns: List[str], key_terms: List[str]) -> str:
-    """Find default column mapping based on common terms."""
-    for term in key_terms:
-        for col in columns:
-            if term in col.lower():
-                return col
-    return ""
+def mapped_columns(mapping: Dict[str, str], columns: List[str]) -> List[str]:
+    """Source columns the cleaning pipeline reads for a given column mapping."""
+    used = [col for col in mapping.values() if col and col in columns]
+    # combine_description_fields only appends the first note column present
+    used += [col for col in NOTE_COLUMNS if col in columns][:1]
+    return list(dict.fromkeys(used))
+
+
+def load_full_csv(path: Path, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load the CSV file, parsing only the given columns."""
+    # PyArrow's multithreaded reader parses straight into columnar buffers
+    return pd.read_csv(path, engine='pyarrow', usecols=usecols)
+
+
+def find_default_column(columns: List[str], key_terms: List[str],
+                        lowered: Optional[List[str]] = None) -> str:
+    """Find default column mapping based on common terms.
+    
+    lowered may hold the precomputed lowercase column names, parallel to columns.
+    """
+    if lowered is None:
+        lowered = [col.lower() for col in columns]
+    return next((col for term in key_terms for col, col_lower in zip(columns, lowered) if term in col_lower), "")
 
 
 def ask_column_mapping(df: pd.DataFrame) -> Dict[str, str]:
     """Interactive column mapping with intelligent defaults."""
     cols = list(df.columns)
+    lowered = [col.lower() for col in cols]
     
     # Define common column patterns
     column_patterns = {
@@ -39,7 +109,7 @@ def ask_column_mapping(df: pd.DataFrame) -> Dict[str, str]:
     
     mapping = {}
     for field, patterns in column_patterns.items():
-        mapping[field] = find_default_column(cols, patterns)
+        mapping[field] = find_default_column(cols, patterns, lowered)
     
     print("\nMap columns for core fields. Press Enter to accept default in ( ).")
     for field in ['date', 'description', 'amount', 'category']:
@@ -53,73 +123,107 @@ def ask_column_mapping(df: pd.DataFrame) -> Dict[str, str]:
 
 def clean_amount_column(series: pd.Series) -> pd.Series:
     """Clean and normalize amount column."""
-    # Convert to string for cleaning
-    s = series.astype(str)
+    # Convert to Arrow-backed strings so cleanup runs in vectorized compute kernels
+    s = series.astype('string[pyarrow]')
     
-    # Remove currency symbols and commas
-    s = s.str.replace(r'[$£€¥,]', '', regex=True)
+    # Remove currency symbols and commas with literal (non-regex) replacements
+    for symbol in CURRENCY_SYMBOLS:
+        s = s.str.replace(symbol, '', regex=False)
     
-    # Handle parentheses notation (12.00) → -12.00
-    s = s.str.replace(r'\((.*)\)', r'-\1', regex=True)
-    
-    # Handle negative signs that might be at the end
-    s = s.str.replace(r'(\d+\.?\d*)-$', r'-\1', regex=True)
+    # Handle parentheses notation (12.00) → -12.00 and trailing negatives 12.00- → -12.00
+    s = s.str.replace(_NEGATIVE_PATTERN, r'-\1\2', regex=True)
     
     # Convert to numeric
-    return pd.to_numeric(s, errors='coerce')
+    return pd.to_numeric(s, errors='coerce').astype('float64')
+
+
+def detect_date_format(series: pd.Series, sample_size: int = 100) -> Optional[str]:
+    """Detect the date format that parses the most values in a sample of the column."""
+    sample = series.dropna().astype(str).head(sample_size)
+    
+    best_format, best_count = None, 0
+    for date_format in DATE_FORMATS:
+        count = pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum()
+        if count > best_count:
+            best_format, best_count = date_format, count
+        if count == len(sample):
+            break
+    
+    return best_format
 
 
 def clean_date_column(series: pd.Series) -> pd.Series:
     """Clean and parse date column."""
-    return pd.to_datetime(series, errors='coerce', dayfirst=False)
+    date_format = None if pd.api.types.is_datetime64_any_dtype(series) else detect_date_format(series)
+    if date_format is None:
+        return pd.to_datetime(series, errors='coerce', dayfirst=False)
+    
+    # A fixed format keeps pandas on its vectorized parser instead of per-row inference
+    dates = pd.to_datetime(series, format=date_format, errors='coerce', cache=True)
+    
+    # Values in some other format still go through the flexible parser
+    unparsed = dates.isna() & series.notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(series[unparsed], errors='coerce', dayfirst=False)
+    
+    return dates
 
 
 def combine_description_fields(df: pd.DataFrame, desc_col: str) -> pd.Series:
     """Combine description with additional note/memo fields."""
-    details = df[desc_col].fillna('') if desc_col in df.columns else pd.Series([''] * len(df))
+    if desc_col in df.columns:
+        details = df[desc_col].astype('string[pyarrow]')
+    else:
+        details = pd.Series('', index=df.index, dtype='string[pyarrow]')
+    details = pa.array(details)
     
     # Look for additional detail columns
-    note_candidates = ['Note', 'note', 'Notes', 'Memo', 'memo', 'Reference', 'ref']
-    for candidate in note_candidates:
+    for candidate in NOTE_COLUMNS:
         if candidate in df.columns:
-            additional = df[candidate].fillna('')
-            details = details + " " + additional
+            additional = pa.array(df[candidate].astype('string[pyarrow]'))
+            # Joins in one pass over the Arrow buffers, treating nulls as ''
+            details = pc.binary_join_element_wise(
+                details, additional, pa.scalar(' ', type=details.type), null_handling='replace'
+            )
             break
     
-    return details.str.strip()
+    details = pc.utf8_trim_whitespace(pc.fill_null(details, ''))
+    return pd.Series(pd.arrays.ArrowStringArray(details), index=df.index)
 
 
 def clean_dataframe(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
     """Clean and standardize the dataframe based on column mapping."""
-    df_clean = df.copy()
-    
     # Clean date column
-    if mapping['date'] and mapping['date'] in df_clean.columns:
-        df_clean['Date'] = clean_date_column(df_clean[mapping['date']])
+    if mapping['date'] and mapping['date'] in df.columns:
+        dates = clean_date_column(df[mapping['date']])
     else:
-        df_clean['Date'] = pd.NaT
+        dates = pd.NaT
     
     # Clean amount column
-    if mapping['amount'] and mapping['amount'] in df_clean.columns:
-        df_clean['Amount'] = clean_amount_column(df_clean[mapping['amount']])
+    if mapping['amount'] and mapping['amount'] in df.columns:
+        amounts = clean_amount_column(df[mapping['amount']])
     else:
-        df_clean['Amount'] = 0.0
+        amounts = 0.0
     
     # Combine description fields
-    df_clean['Details'] = combine_description_fields(df_clean, mapping['description'])
+    details = combine_description_fields(df, mapping['description'])
     
     # Add category if provided
-    if mapping['category'] and mapping['category'] in df_clean.columns:
-        df_clean['Category'] = df_clean[mapping['category']].fillna('Uncategorized')
+    if mapping['category'] and mapping['category'] in df.columns:
+        categories = df[mapping['category']].fillna('Uncategorized')
     else:
-        df_clean['Category'] = 'Uncategorized'
+        categories = 'Uncategorized'
     
-    # Select and reorder final columns
-    final_columns = ['Date', 'Amount', 'Details', 'Category']
-    df_final = df_clean[final_columns].copy()
+    # Build final columns directly from the freshly cleaned Series (no extra copies)
+    df_final = pd.DataFrame({
+        'Date': dates,
+        'Amount': amounts,
+        'Details': details,
+        'Category': categories
+    }, index=df.index, copy=False)
     
     # Remove rows with invalid dates or amounts
-    df_final = df_final.dropna(subset=['Date', 'Amount'])
+    df_final.dropna(subset=['Date', 'Amount'], inplace=True)
     
     return df_final
 
@@ -129,69 +233,97 @@ def categorize_transaction(details: str, amount: float) -> str:
     details_lower = details.lower()
     
     # eBay transactions
-    if 'ebay' in details_lower:
+    if _CATEGORY_RES['eBay'].search(details_lower):
         return 'eBay'
     
     # Common income patterns
-    income_patterns = ['salary', 'wage', 'deposit', 'transfer in', 'refund']
-    if amount > 0 and any(pattern in details_lower for pattern in income_patterns):
+    if amount > 0 and _CATEGORY_RES['Income'].search(details_lower):
         return 'Income'
     
     # Common expense patterns
-    expense_categories = {
-        'Grocery': ['grocery', 'supermarket', 'food', 'walmart', 'target'],
-        'Gas': ['gas', 'fuel', 'petrol', 'shell', 'bp', 'chevron'],
-        'Utilities': ['electric', 'gas bill', 'water', 'internet', 'phone'],
-        'Dining': ['restaurant', 'cafe', 'pizza', 'mcdonald', 'starbucks'],
-        'Shopping': ['amazon', 'store', 'retail', 'purchase']
-    }
-    
-    for category, patterns in expense_categories.items():
-        if any(pattern in details_lower for pattern in patterns):
+    for category in EXPENSE_CATEGORIES:
+        if _CATEGORY_RES[category].search(details_lower):
             return category
     
     return 'Other'
 
 
-def filter_transactions(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Split transactions into different categories."""
+def _lower_details(details: pd.Series) -> pd.Series:
+    """Lowercase transaction details once for keyword matching."""
+    return details.fillna('').astype(str).str.lower()
+
+
+def _categorize_lowered(details_lower: pd.Series, amounts: pd.Series) -> pd.Series:
+    """Auto-categorize transactions from already-lowercased details with vectorized keyword masks."""
+    # Statements repeat the same merchants, so match each distinct description once
+    codes, uniques = pd.factorize(details_lower)
+    uniques = pd.Series(uniques, dtype='string[pyarrow]')
+    
+    # One vectorized mask per category (pattern strings run on Arrow's regex kernel)
+    hits = {
+        category: uniques.str.contains(pattern.pattern, regex=True).to_numpy(dtype=bool)[codes]
+        for category, pattern in _CATEGORY_RES.items()
+    }
+    hits['Income'] &= (amounts > 0).to_numpy()
+    
+    categories = np.select(list(hits.values()), list(hits.keys()), default='Other')
+    return pd.Series(categories, index=details_lower.index, dtype=object)
+
+
+def _link_to_master(filtered_df: pd.DataFrame, source: pd.Series) -> pd.DataFrame:
+    """Add the Source formula column (aligned on index) to a filtered view."""
+    if filtered_df.empty:
+        return filtered_df
+    return filtered_df.assign(Source=source)
+
+
+def filter_transactions(df: pd.DataFrame, row_offset: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Split transactions into different categories.
+    
+    row_offset is the number of Master rows that precede df (used when streaming chunks).
+    """
     # Add row numbers for linking
     df = df.reset_index(drop=True)
-    df['Master_Row'] = df.index + 2  # +2 because sheets are 1-indexed and include header
+    df['Master_Row'] = df.index + 2 + row_offset  # +2 because sheets are 1-indexed and include header
+    
+    # Lowercase once; shared by categorization and the eBay filter
+    details_lower = _lower_details(df['Details'])
     
     # Auto-categorize if not already done
     if 'Category' not in df.columns or df['Category'].isna().all():
-        df['Category'] = df.apply(lambda row: categorize_transaction(row['Details'], row['Amount']), axis=1)
+        df['Category'] = _categorize_lowered(details_lower, df['Amount'])
     
-    # Create filtered datasets
-    master = df.copy()
-    incoming = df[df['Amount'] > 0].copy()
-    outgoing = df[df['Amount'] < 0].copy()
+    # Create filtered datasets (boolean indexing already returns new frames)
+    master = df
+    incoming = df[df['Amount'] > 0]
+    outgoing = df[df['Amount'] < 0]
     
     # eBay transactions (typically outgoing)
-    ebay_mask = df['Details'].str.contains('ebay', case=False, na=False)
-    ebay_outgoing = df[ebay_mask & (df['Amount'] < 0)].copy()
+    ebay_mask = details_lower.str.contains('ebay', regex=False)
+    ebay_outgoing = df[ebay_mask & (df['Amount'] < 0)]
     
-    # Add source column for filtered views
-    for filtered_df in [incoming, outgoing, ebay_outgoing]:
-        if not filtered_df.empty:
-            filtered_df['Source'] = filtered_df['Master_Row'].apply(lambda x: f"=Master!A{x}")
+    # Add source column for filtered views, formatting each Master row link only once
+    source = "=Master!A" + df['Master_Row'].astype(str)
+    incoming, outgoing, ebay_outgoing = (
+        _link_to_master(filtered_df, source) for filtered_df in (incoming, outgoing, ebay_outgoing)
+    )
     
     return master, incoming, outgoing, ebay_outgoing
 
 
+def _export_csv(df: pd.DataFrame, path: Path):
+    """Write a dataset to CSV without the Master_Row helper column."""
+    # Remove Master_Row column from CSV exports (keep it only for Google Sheets linking)
+    df.drop(columns=['Master_Row'], errors='ignore').to_csv(path, index=False)
+
+
 def save_datasets_to_csv(master: pd.DataFrame, incoming: pd.DataFrame, 
                         outgoing: pd.DataFrame, ebay_outgoing: pd.DataFrame,
                         output_dir: Path = Path("output")) -> Dict[str, Path]:
     """Save all datasets to CSV files in output directory."""
     output_dir.mkdir(exist_ok=True)
     
-    files = {
-        'master': output_dir / 'cleaned_master.csv',
-        'incoming': output_dir / 'incoming_payments.csv',
-        'outgoing': output_dir / 'outgoing_payments.csv',
-        'ebay': output_dir / 'ebay_outgoing.csv'
-    }
+    files = {name: output_dir / filename for name, filename in DATASET_FILES.items()}
     
     datasets = {
         'master': master,
@@ -200,10 +332,9 @@ def save_datasets_to_csv(master: pd.DataFrame, incoming: pd.DataFrame,
         'ebay': ebay_outgoing
     }
     
-    for name, df in datasets.items():
-        # Remove Master_Row column from CSV exports (keep it only for Google Sheets linking)
-        export_df = df.drop(columns=['Master_Row'], errors='ignore')
-        export_df.to_csv(files[name], index=False)
+    # The four files are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=len(datasets)) as executor:
+        list(executor.map(_export_csv, datasets.values(), [files[name] for name in datasets]))
     
     print(f"\nSaved CSV files to {output_dir}:")
     for name, path in files.items():
@@ -212,6 +343,65 @@ def save_datasets_to_csv(master: pd.DataFrame, incoming: pd.DataFrame,
     return files
 
 
+def stream_datasets_to_csv(path: Path, mapping: Dict[str, str],
+                           output_dir: Path = Path("output"),
+                           chunksize: int = 100_000,
+                           usecols: Optional[List[str]] = None,
+                           preview_rows: int = 5) -> Tuple[Dict[str, int], pd.DataFrame]:
+    """Clean, filter and save a CSV chunk by chunk without holding it all in memory.
+    
+    Produces the same files as save_datasets_to_csv and returns row counts per dataset along
+    with the first preview_rows cleaned rows. No files are written if nothing survives cleaning.
+    """
+    files = {name: output_dir / filename for name, filename in DATASET_FILES.items()}
+    counts = {name: 0 for name in files}
+    headers_written = {name: False for name in files}
+    preview = pd.DataFrame()
+    
+    with ExitStack() as stack:
+        handles = {}
+        
+        for chunk in pd.read_csv(path, chunksize=chunksize, usecols=usecols):
+            df_clean = clean_dataframe(chunk, mapping)
+            master, incoming, outgoing, ebay_outgoing = filter_transactions(df_clean, row_offset=counts['master'])
+            # Every other dataset is a subset of master, so an empty master chunk has nothing to write
+            if master.empty:
+                continue
+            if not handles:
+                output_dir.mkdir(exist_ok=True)
+                handles = {name: stack.enter_context(file_path.open('w', newline='')) for name, file_path in files.items()}
+                preview = df_clean.head(preview_rows)
+            datasets = {
+                'master': master,
+                'incoming': incoming,
+                'outgoing': outgoing,
+                'ebay': ebay_outgoing
+            }
+            
+            for name, df in datasets.items():
+                # Filtered chunks only gain a Source column when non-empty, so defer the header
+                if df.empty:
+                    continue
+                export_df = df.drop(columns=['Master_Row'], errors='ignore')
+                export_df.to_csv(handles[name], index=False, header=not headers_written[name])
+                headers_written[name] = True
+                counts[name] += len(df)
+        
+        if not handles:
+            return counts, preview
+        
+        # Datasets with no rows still get a header-only file
+        for name, handle in handles.items():
+            if not headers_written[name]:
+                pd.DataFrame(columns=['Date', 'Amount', 'Details', 'Category']).to_csv(handle, index=False)
+    
+    print(f"\nSaved CSV files to {output_dir}:")
+    for name, file_path in files.items():
+        print(f"  - {file_path} ({counts[name]} rows)")
+    
+    return counts, preview
+
+
 def get_preview_data(df: pd.DataFrame, n: int = 5) -> str:
     """Get formatted preview of cleaned data."""
     if df.empty:
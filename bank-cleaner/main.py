@@ -2,19 +2,31 @@
 """Enhanced CSV to Google Sheets uploader with multi-sheet support and formatting."""
 
 import argparse
+import logging
 from pathlib import Path
 import sys
+from typing import Dict
 
 from auth import get_credentials
 from data_cleaner import (
-    preview_csv, ask_column_mapping, clean_dataframe, filter_transactions,
-    save_datasets_to_csv, get_preview_data
+    preview_csv, mapped_columns, load_full_csv, ask_column_mapping, clean_dataframe,
+    filter_transactions, save_datasets_to_csv, stream_datasets_to_csv, get_preview_data
 )
 from sheets_manager import (
     SheetsManager, interactive_spreadsheet_selection, interactive_sheet_selection
 )
 
 
+def print_dataset_summary(counts: Dict[str, int]):
+    """Print the number of transactions in each dataset."""
+    print(f"Dataset Summary:")
+    for name, count in counts.items():
+        if count:
+            print(f"  - {name}: {count} transactions")
+        else:
+            print(f"  - {name}: 0 transactions (empty)")
+
+
 def main():
     """Main workflow for CSV cleaning and Google Sheets upload."""
     parser = argparse.ArgumentParser(
@@ -63,8 +75,19 @@ Examples:
         help="Overwrite existing sheet data (default: True)"
     )
     
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only log warnings and errors from Google Sheets operations"
+    )
+    
     args = parser.parse_args()
     
+    # Sheets progress goes to stdout like the rest of the output; other libraries keep their defaults
+    sheets_logger = logging.getLogger("sheets_manager")
+    sheets_logger.addHandler(logging.StreamHandler(sys.stdout))
+    sheets_logger.setLevel(logging.WARNING if args.quiet else logging.INFO)
+    
     # Validate input file
     csv_path = Path(args.csv_file)
     if not csv_path.exists():
@@ -76,27 +99,57 @@ Examples:
     print("=" * 60)
     
     try:
-        # Step 1: Load and preview CSV
+        # Step 1: Preview CSV (only the first rows are parsed here)
         print(f"\n📁 Loading CSV file: {csv_path}")
-        df_raw = preview_csv(csv_path, n=5)
+        df_preview = preview_csv(csv_path, n=5)
         
-        if df_raw.empty:
+        if df_preview.empty:
             print("Error: CSV file is empty or could not be read.")
             sys.exit(1)
         
         # Step 2: Column mapping
         print(f"\n🔍 Column Mapping")
         print("-" * 30)
-        mapping = ask_column_mapping(df_raw)
+        mapping = ask_column_mapping(df_preview)
         
         if not mapping['amount']:
             print("Error: Amount column is required. Exiting.")
             sys.exit(1)
         
+        # Only the mapped columns are parsed from here on
+        usecols = mapped_columns(mapping, list(df_preview.columns))
+        
+        if args.skip_upload:
+            # Only CSV output is needed, so stream the file instead of holding every dataset
+            print(f"\n🧹 Cleaning and Saving Data")
+            print("-" * 30)
+            counts, preview = stream_datasets_to_csv(csv_path, mapping, args.output_dir, usecols=usecols)
+            
+            if counts['master'] == 0:
+                print("Error: No valid data after cleaning.")
+                sys.exit(1)
+            
+            print(f"✅ Cleaned {counts['master']} transactions")
+            
+            print(f"\n👀 Preview of Cleaned Data:")
+            print("-" * 30)
+            print(get_preview_data(preview, n=5))
+            
+            print_dataset_summary({
+                'Master': counts['master'],
+                'Incoming': counts['incoming'],
+                'Outgoing': counts['outgoing'],
+                'eBay_Outgoing': counts['ebay']
+            })
+            
+            print(f"\n✅ CSV processing complete! Files saved in {args.output_dir}")
+            print("Skipping Google Sheets upload as requested.")
+            return
+        
         # Step 3: Clean data
         print(f"\n🧹 Cleaning Data")
         print("-" * 30)
-        df_clean = clean_dataframe(df_raw, mapping)
+        df_clean = clean_dataframe(load_full_csv(csv_path, usecols), mapping)
         
         if df_clean.empty:
             print("Error: No valid data after cleaning.")
@@ -121,24 +174,13 @@ Examples:
             'eBay_Outgoing': ebay_outgoing
         }
         
-        # Print summary
-        print(f"Dataset Summary:")
-        for name, df in datasets.items():
-            if not df.empty:
-                print(f"  - {name}: {len(df)} transactions")
-            else:
-                print(f"  - {name}: 0 transactions (empty)")
+        print_dataset_summary({name: len(df) for name, df in datasets.items()})
         
         # Step 6: Save to CSV files
         print(f"\n💾 Saving CSV Files")
         print("-" * 30)
         saved_files = save_datasets_to_csv(master, incoming, outgoing, ebay_outgoing, args.output_dir)
         
-        if args.skip_upload:
-            print(f"\n✅ CSV processing complete! Files saved in {args.output_dir}")
-            print("Skipping Google Sheets upload as requested.")
-            return
-        
         # Step 7: Google Sheets Authentication
         print(f"\n🔐 Authenticating with Google Sheets")
         print("-" * 30)
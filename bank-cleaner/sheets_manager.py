@@ -1,13 +1,238 @@
 # sheets_manager.py
 """Google Sheets management utilities with formatting and multi-sheet support."""
 
+import numpy as np
 import pandas as pd
-import gspread
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from typing import Dict, List, Optional, Tuple, Any
+from googleapiclient.model import JsonModel
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+from functools import cached_property
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the standard json module
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Cells per updateCells request, keeping payloads well under the 10MB request limit
+MAX_CELLS_PER_REQUEST = 50_000
+
+# Seconds a cached spreadsheet metadata response stays valid
+METADATA_CACHE_TTL = 30
+
+# Largest page the Drive files.list endpoint returns
+DRIVE_MAX_PAGE_SIZE = 1000
+
+# Day zero of Google Sheets date serial numbers
+SHEETS_EPOCH = datetime(1899, 12, 30)
+
+# Sheets/Drive write quota: requests per minute per user
+REQUESTS_PER_MINUTE = 300
+
+# Transient HTTP statuses worth retrying with backoff
+RETRYABLE_STATUSES = (429, 500, 503)
+MAX_RETRIES = 5
+
+# Built API clients keyed by (credentials identity, API name, version), shared across managers
+_SERVICE_CACHE: Dict[Tuple[Any, str, str], Any] = {}
+
+# Local title -> spreadsheet ID cache, skipping the Drive search on repeat runs
+SPREADSHEET_CACHE_FILE = Path.home() / ".cache" / "bank-cleaner" / "spreadsheets.json"
+SPREADSHEET_CACHE_TTL = 24 * 60 * 60  # seconds before a cached ID is re-verified
+
+
+def _account_key(credentials) -> Optional[str]:
+    """Stable, non-secret identifier of the account behind credentials, if there is one."""
+    identity = (
+        getattr(credentials, 'service_account_email', None)
+        or getattr(credentials, 'refresh_token', None)
+    )
+    if not identity:
+        return None
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+
+
+def _load_spreadsheet_cache() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Load the cached spreadsheet IDs per account, or an empty cache if unavailable."""
+    try:
+        cache = json.loads(SPREADSHEET_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_spreadsheet_cache(cache: Dict[str, Dict[str, Dict[str, Any]]]):
+    """Persist the spreadsheet ID cache."""
+    try:
+        SPREADSHEET_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SPREADSHEET_CACHE_FILE.write_text(json.dumps(cache, indent=2))
+    except OSError as e:
+        logger.warning("Could not save spreadsheet cache: %s", e)
+
+
+def _cached_spreadsheet(account: Optional[str], title: str) -> Optional[Dict[str, Any]]:
+    """The cached entry for a title in an account, if any."""
+    if account is None:
+        return None
+    return _load_spreadsheet_cache().get(account, {}).get(title)
+
+
+def _cache_spreadsheet_id(account: Optional[str], title: str, spreadsheet_id: str):
+    """Remember the spreadsheet ID for a title in an account."""
+    if account is None:
+        return
+    cache = _load_spreadsheet_cache()
+    cache.setdefault(account, {})[title] = {"id": spreadsheet_id, "cached_at": time.time()}
+    _save_spreadsheet_cache(cache)
+
+
+def _forget_spreadsheet_id(account: Optional[str], spreadsheet_id: str):
+    """Drop every cached title of an account that points at a spreadsheet ID."""
+    cache = _load_spreadsheet_cache()
+    titles = cache.get(account, {})
+    stale = [title for title, entry in titles.items() if entry["id"] == spreadsheet_id]
+    if not stale:
+        return
+    for title in stale:
+        del titles[title]
+    _save_spreadsheet_cache(cache)
+
+
+def _number_value(value: float) -> Dict[str, Any]:
+    """Cell data for a float, or an empty cell for NaN."""
+    if math.isnan(value):
+        return {}
+    return {"userEnteredValue": {"numberValue": value}}
+
+
+def _integer_value(value: int) -> Dict[str, Any]:
+    """Cell data for an integer from a column that cannot hold missing values."""
+    return {"userEnteredValue": {"numberValue": value}}
+
+
+def _string_value(value: Optional[str]) -> Dict[str, Any]:
+    """Cell data for a string, sending '=' strings as formulas."""
+    if value is None:
+        return {}
+    if value.startswith('='):
+        return {"userEnteredValue": {"formulaValue": value}}
+    return {"userEnteredValue": {"stringValue": value}}
+
+
+def _bool_value(value: Optional[bool]) -> Dict[str, Any]:
+    """Cell data for a boolean value, or an empty cell for missing data."""
+    if value is None:
+        return {}
+    return {"userEnteredValue": {"boolValue": bool(value)}}
+
+
+def _cell_value(value: Any) -> Dict[str, Any]:
+    """Cell data for a value of any type, sending '=' strings as formulas."""
+    if pd.isna(value):
+        return {}
+    if isinstance(value, (bool, np.bool_)):
+        return {"userEnteredValue": {"boolValue": bool(value)}}
+    if isinstance(value, (int, float, np.number)):
+        return {"userEnteredValue": {"numberValue": float(value)}}
+    if isinstance(value, datetime):
+        serial = (value.replace(tzinfo=None) - SHEETS_EPOCH) / timedelta(days=1)
+        return {"userEnteredValue": {"numberValue": serial}}
+    return _string_value(str(value))
+
+
+class _OrjsonModel(JsonModel):
+    """JsonModel that encodes and decodes bodies with orjson, which is much faster on the
+    large nested updateCells payloads uploads produce."""
+    
+    def serialize(self, body_value):
+        if self._data_wrapper and isinstance(body_value, dict) and "data" not in body_value:
+            body_value = {"data": body_value}
+        try:
+            encoded = orjson.dumps(body_value, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            # Values orjson rejects (e.g. integers beyond 64 bits) take the standard path
+            return json.dumps(body_value)
+        # The client sizes and batches bodies as str, so non-ASCII output needs json's escaping
+        if not encoded.isascii():
+            return json.dumps(body_value)
+        return encoded.decode("ascii")
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode("utf-8") if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+def _service(name: str, version: str, credentials):
+    """Build an API client once per credentials, using the discovery document bundled with the library."""
+    key = (_account_key(credentials) or id(credentials), name, version)
+    if key not in _SERVICE_CACHE:
+        _SERVICE_CACHE[key] = build(
+            name, version, credentials=credentials, static_discovery=True,
+            model=_OrjsonModel() if orjson is not None else None
+        )
+    return _SERVICE_CACHE[key]
+
+
+def _last_used_spreadsheet_id(account: Optional[str]) -> Optional[str]:
+    """The most recently cached spreadsheet ID of an account, if any."""
+    titles = _load_spreadsheet_cache().get(account, {}) if account is not None else {}
+    if not titles:
+        return None
+    return max(titles.values(), key=lambda entry: entry["cached_at"])["id"]
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks until enough tokens are available."""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def consume(self, tokens: int = 1):
+        """Take tokens from the bucket, sleeping only when it has run dry."""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retry_delay(error: Exception, attempt: int,
+                 retry_statuses: Tuple[int, ...] = RETRYABLE_STATUSES) -> Optional[float]:
+    """Seconds to wait before retrying a failed request, or None if it should not be retried."""
+    if not isinstance(error, HttpError) or attempt >= MAX_RETRIES:
+        return None
+    if error.resp.status not in retry_statuses:
+        return None
+    retry_after = error.resp.get('retry-after')
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return 2 ** attempt + random.random()
 
 
 class SheetsManager:
@@ -15,300 +240,553 @@ class SheetsManager:
     
     def __init__(self, credentials):
         self.creds = credentials
-        self.gc = gspread.authorize(credentials)
-        self.sheets_service = build('sheets', 'v4', credentials=credentials)
-        self.drive_service = build('drive', 'v3', credentials=credentials)
+        # Read-only metadata responses keyed by (kind, spreadsheet_id) -> (fetched_at, value),
+        # dropped on writes and expired after METADATA_CACHE_TTL
+        self._metadata_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        # Spreadsheet IDs created or verified by this instance, which need no re-check
+        self._known_ids: Set[str] = set()
+        # Account identity the on-disk spreadsheet ID cache is keyed by
+        self._account = _account_key(credentials)
+        self._bucket = TokenBucket(rate=REQUESTS_PER_MINUTE / 60, capacity=REQUESTS_PER_MINUTE)
+    
+    @cached_property
+    def sheets_service(self):
+        """Sheets API client, built on first use."""
+        return _service('sheets', 'v4', self.creds)
+    
+    @cached_property
+    def drive_service(self):
+        """Drive API client, built on first use."""
+        return _service('drive', 'v3', self.creds)
+    
+    def _call(self, request, retry_statuses: Tuple[int, ...] = RETRYABLE_STATUSES) -> Any:
+        """Execute an API request under the rate limit, retrying transient errors."""
+        attempt = 0
+        while True:
+            self._bucket.consume()
+            try:
+                return request.execute()
+            except HttpError as e:
+                delay = _retry_delay(e, attempt, retry_statuses)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+    
+    def _invalidate_metadata(self, spreadsheet_id: str):
+        """Forget cached metadata for a spreadsheet after it is modified."""
+        for key in [key for key in self._metadata_cache if key[1] == spreadsheet_id]:
+            del self._metadata_cache[key]
+    
+    def _cached_metadata(self, key: Tuple[str, str]) -> Optional[Any]:
+        """Return a cached metadata value if it is still fresh."""
+        entry = self._metadata_cache.get(key)
+        if entry is None:
+            return None
+        fetched_at, value = entry
+        if time.monotonic() - fetched_at > METADATA_CACHE_TTL:
+            del self._metadata_cache[key]
+            return None
+        return value
     
     def find_spreadsheet_by_name(self, title: str) -> Optional[str]:
         """Find spreadsheet by exact name match."""
+        # Fresh cache hits skip the API entirely; stale ones get a cheap existence check
+        cached = _cached_spreadsheet(self._account, title)
+        if cached:
+            if time.time() - cached["cached_at"] < SPREADSHEET_CACHE_TTL:
+                return cached["id"]
+            if self._spreadsheet_title(cached["id"]) is not None:
+                _cache_spreadsheet_id(self._account, title, cached["id"])
+                self._known_ids.add(cached["id"])
+                return cached["id"]
+        
         query = f"name = '{title}' and mimeType = 'application/vnd.google-apps.spreadsheet' and trashed = false"
         try:
-            response = self.drive_service.files().list(
+            response = self._call(self.drive_service.files().list(
                 q=query, 
                 spaces='drive', 
-                fields='files(id, name, modifiedTime)'
-            ).execute()
+                pageSize=1,
+                fields='files(id)'
+            ))
             files = response.get('files', [])
             if files:
+                _cache_spreadsheet_id(self._account, title, files[0]['id'])
+                self._known_ids.add(files[0]['id'])
                 return files[0]['id']
         except HttpError as e:
-            print(f"Error searching for spreadsheet: {e}")
+            logger.error("Error searching for spreadsheet: %s", e)
         return None
     
+    def _forget_if_gone(self, spreadsheet_id: str, error: HttpError):
+        """Drop a spreadsheet ID from the caches when the API says it is missing or forbidden."""
+        if error.resp.status in (403, 404):
+            _forget_spreadsheet_id(self._account, spreadsheet_id)
+            self._known_ids.discard(spreadsheet_id)
+    
+    def _spreadsheet_title(self, spreadsheet_id: str) -> Optional[str]:
+        """Quietly check a spreadsheet is accessible and not trashed, returning its title."""
+        try:
+            response = self._call(self.drive_service.files().get(
+                fileId=spreadsheet_id,
+                fields='name, trashed'
+            ))
+        except HttpError as e:
+            self._forget_if_gone(spreadsheet_id, e)
+            return None
+        if response.get('trashed'):
+            # Trashed files still resolve by ID, but the name search excludes them too
+            _forget_spreadsheet_id(self._account, spreadsheet_id)
+            return None
+        return response['name']
+    
     def find_spreadsheet_by_id(self, spreadsheet_id: str) -> Optional[Dict[str, Any]]:
         """Verify spreadsheet exists by ID and return metadata."""
+        key = ('spreadsheet', spreadsheet_id)
+        cached = self._cached_metadata(key)
+        if cached is not None:
+            return cached
         try:
-            response = self.drive_service.files().get(
-                fileId=spreadsheet_id,
-                fields='id, name, modifiedTime'
-            ).execute()
-            return response
+            response = self._call(self.sheets_service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields='properties(title),spreadsheetId'
+            ))
+            metadata = {"id": response["spreadsheetId"], "name": response["properties"]["title"]}
+            self._metadata_cache[key] = (time.monotonic(), metadata)
+            self._known_ids.add(spreadsheet_id)
+            return metadata
         except HttpError as e:
-            print(f"Error accessing spreadsheet by ID: {e}")
+            self._forget_if_gone(spreadsheet_id, e)
+            logger.error("Error accessing spreadsheet by ID: %s", e)
             return None
     
     def list_user_spreadsheets(self, max_results: int = 20) -> List[Dict[str, Any]]:
         """List user's recent spreadsheets."""
         query = "mimeType = 'application/vnd.google-apps.spreadsheet' and trashed = false"
         try:
-            response = self.drive_service.files().list(
-                q=query,
-                pageSize=max_results,
-                orderBy='modifiedTime desc',
-                fields='files(id, name, modifiedTime)'
-            ).execute()
-            return response.get('files', [])
+            files = []
+            page_token = None
+            while len(files) < max_results:
+                response = self._call(self.drive_service.files().list(
+                    q=query,
+                    pageSize=min(max_results - len(files), DRIVE_MAX_PAGE_SIZE),
+                    pageToken=page_token,
+                    orderBy='modifiedTime desc',
+                    fields='nextPageToken, files(id, name, modifiedTime)'
+                ))
+                files.extend(response.get('files', []))
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+            return files[:max_results]
         except HttpError as e:
-            print(f"Error listing spreadsheets: {e}")
+            logger.error("Error listing spreadsheets: %s", e)
             return []
     
     def create_new_spreadsheet(self, title: str) -> str:
         """Create a new spreadsheet and return its ID."""
         try:
             body = {"properties": {"title": title}}
-            spreadsheet = self.sheets_service.spreadsheets().create(body=body).execute()
+            # create is not idempotent: a 5xx may come after the spreadsheet was made, so only
+            # rate-limit rejections are retried
+            spreadsheet = self._call(self.sheets_service.spreadsheets().create(body=body), retry_statuses=(429,))
             spreadsheet_id = spreadsheet.get('spreadsheetId')
-            print(f"Created new spreadsheet: '{title}' (ID: {spreadsheet_id})")
+            _cache_spreadsheet_id(self._account, title, spreadsheet_id)
+            self._known_ids.add(spreadsheet_id)
+            logger.info("Created new spreadsheet: '%s' (ID: %s)", title, spreadsheet_id)
             return spreadsheet_id
         except HttpError as e:
-            print(f"Error creating spreadsheet: {e}")
+            logger.error("Error creating spreadsheet: %s", e)
             raise
     
     def get_or_create_spreadsheet(self, title: str, spreadsheet_id: Optional[str] = None) -> str:
         """Get existing spreadsheet or create new one."""
+        # IDs this instance already created or verified need no round trip
+        if spreadsheet_id in self._known_ids:
+            return spreadsheet_id
+        
         # If ID provided, try to use it
         if spreadsheet_id:
             metadata = self.find_spreadsheet_by_id(spreadsheet_id)
             if metadata:
-                print(f"Found existing spreadsheet: '{metadata['name']}' (ID: {spreadsheet_id})")
+                logger.info("Found existing spreadsheet: '%s' (ID: %s)", metadata['name'], spreadsheet_id)
                 return spreadsheet_id
             else:
-                print(f"Spreadsheet with ID {spreadsheet_id} not found or not accessible.")
+                logger.warning("Spreadsheet with ID %s not found or not accessible.", spreadsheet_id)
         
         # Try to find by name
         found_id = self.find_spreadsheet_by_name(title)
         if found_id:
-            print(f"Found existing spreadsheet: '{title}' (ID: {found_id})")
+            logger.info("Found existing spreadsheet: '%s' (ID: %s)", title, found_id)
             return found_id
         
         # Create new
         return self.create_new_spreadsheet(title)
     
+    def _sheet_properties(self, spreadsheet_id: str) -> Dict[str, Dict[str, Any]]:
+        """Map sheet titles to their properties (ID and grid size), cached per spreadsheet."""
+        key = ('sheets', spreadsheet_id)
+        cached = self._cached_metadata(key)
+        if cached is not None:
+            return cached
+        try:
+            spreadsheet = self._call(self.sheets_service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields='sheets.properties(sheetId,title,gridProperties(rowCount,columnCount))'
+            ))
+        except HttpError as e:
+            self._forget_if_gone(spreadsheet_id, e)
+            raise
+        sheets = {
+            sheet['properties']['title']: sheet['properties']
+            for sheet in spreadsheet.get('sheets', [])
+        }
+        self._metadata_cache[key] = (time.monotonic(), sheets)
+        return sheets
+    
     def get_sheet_names(self, spreadsheet_id: str) -> List[str]:
         """Get list of sheet names in spreadsheet."""
         try:
-            spreadsheet = self.sheets_service.spreadsheets().get(
-                spreadsheetId=spreadsheet_id
-            ).execute()
-            sheets = spreadsheet.get('sheets', [])
-            return [sheet['properties']['title'] for sheet in sheets]
+            return list(self._sheet_properties(spreadsheet_id))
         except HttpError as e:
-            print(f"Error getting sheet names: {e}")
+            logger.error("Error getting sheet names: %s", e)
             return []
     
-    def create_or_clear_worksheet(self, spreadsheet_id: str, sheet_name: str, 
-                                 rows: int = 1000, cols: int = 10) -> gspread.Worksheet:
-        """Create new worksheet or clear existing one."""
-        try:
-            spreadsheet = self.gc.open_by_key(spreadsheet_id)
-            
-            # Try to get existing worksheet
-            try:
-                worksheet = spreadsheet.worksheet(sheet_name)
-                worksheet.clear()  # Clear existing data
-                print(f"Cleared existing sheet: '{sheet_name}'")
-            except gspread.exceptions.WorksheetNotFound:
-                # Create new worksheet
-                worksheet = spreadsheet.add_worksheet(
-                    title=sheet_name, 
-                    rows=rows, 
-                    cols=cols
-                )
-                print(f"Created new sheet: '{sheet_name}'")
-            
-            return worksheet
-        except Exception as e:
-            print(f"Error managing worksheet '{sheet_name}': {e}")
-            raise
+    def _ensure_sheet(self, spreadsheet_id: str, sheet_name: str,
+                      rows: int = 1000, cols: int = 10) -> int:
+        """Return the sheet ID for a sheet title, adding the sheet if it doesn't exist."""
+        sheets = self._sheet_properties(spreadsheet_id)
+        if sheet_name in sheets:
+            return sheets[sheet_name]['sheetId']
+        
+        response = self._call(self.sheets_service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={"requests": [{
+                "addSheet": {
+                    "properties": {
+                        "title": sheet_name,
+                        "gridProperties": {"rowCount": rows, "columnCount": cols}
+                    }
+                }
+            }]}
+        ))
+        # The reply carries the new sheet's properties, so the cached map stays current
+        properties = response['replies'][0]['addSheet']['properties']
+        sheets[sheet_name] = properties
+        logger.info("Created new sheet: '%s'", sheet_name)
+        return properties['sheetId']
     
     def upload_dataframe_to_sheet(self, spreadsheet_id: str, sheet_name: str, 
                                  df: pd.DataFrame, overwrite: bool = True) -> bool:
         """Upload DataFrame to specified sheet with formatting."""
         try:
             if df.empty:
-                print(f"No data to upload to '{sheet_name}'")
+                logger.info("No data to upload to '%s'", sheet_name)
                 return False
             
-            # Create or get worksheet
-            worksheet = self.create_or_clear_worksheet(
-                spreadsheet_id, sheet_name, 
-                rows=len(df) + 50, cols=len(df.columns) + 5
-            )
-            
-            # Prepare data for upload
-            # Convert DataFrame to list of lists
-            header = list(df.columns)
-            data = df.fillna('').astype(str).values.tolist()
-            all_data = [header] + data
-            
-            # Upload data
-            if overwrite:
-                worksheet.clear()
-            
-            # Update in batches for better performance
-            worksheet.update(all_data, value_input_option='USER_ENTERED')
-            
-            print(f"Uploaded {len(df)} rows to '{sheet_name}' in spreadsheet {spreadsheet_id}")
+            for requests in self._build_upload_batches(spreadsheet_id, sheet_name, df, overwrite):
+                self._call(self.sheets_service.spreadsheets().batchUpdate(
+                    spreadsheetId=spreadsheet_id,
+                    body={"requests": requests}
+                ))
+            self._invalidate_metadata(spreadsheet_id)
             
-            # Apply formatting
-            self._format_worksheet(spreadsheet_id, worksheet, df)
+            logger.info("Uploaded %s rows to '%s' in spreadsheet %s", len(df), sheet_name, spreadsheet_id)
             
             return True
             
         except Exception as e:
-            print(f"Error uploading to sheet '{sheet_name}': {e}")
+            logger.error("Error uploading to sheet '%s': %s", sheet_name, e)
             return False
     
-    def _format_worksheet(self, spreadsheet_id: str, worksheet: gspread.Worksheet, df: pd.DataFrame):
-        """Apply formatting to worksheet."""
+    def _build_upload_batches(self, spreadsheet_id: str, sheet_name: str,
+                              df: pd.DataFrame, overwrite: bool) -> Iterator[List[Dict[str, Any]]]:
+        """Prepare the worksheet and return a lazy stream of the batchUpdate request lists that fill it."""
+        # Create or get worksheet; clearing happens inside the batch below when overwriting
+        sheet_id = self._ensure_sheet(
+            spreadsheet_id, sheet_name, 
+            rows=len(df) + 50, cols=len(df.columns) + 5
+        )
+        grid_size = self._sheet_properties(spreadsheet_id)[sheet_name].get('gridProperties', {})
+        row_count = grid_size.get('rowCount', 0)
+        col_count = grid_size.get('columnCount', 0)
+        
+        setup = []
+        if overwrite:
+            # Clear existing values inside the batch rather than with a separate call
+            setup.append({
+                "updateCells": {
+                    "range": {"sheetId": sheet_id},
+                    "fields": "userEnteredValue"
+                }
+            })
+        
+        # Freeze the header row, growing the grid in the same request when the data needs it
+        grid = {"frozenRowCount": 1}
+        if row_count < len(df) + 1 or col_count < len(df.columns):
+            grid["rowCount"] = max(row_count, len(df) + 1)
+            grid["columnCount"] = max(col_count, len(df.columns))
+        setup.append({
+            "updateSheetProperties": {
+                "properties": {
+                    "sheetId": sheet_id,
+                    "gridProperties": grid
+                },
+                "fields": "gridProperties(" + ",".join(grid) + ")"
+            }
+        })
+        
+        return self._iter_batches(sheet_id, df, setup)
+    
+    def _iter_batches(self, sheet_id: int, df: pd.DataFrame,
+                      setup: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Yield batchUpdate request lists: setup with the first chunk, then chunks, formatting last."""
+        # Values and formatting go out together; only very large frames need extra batches
+        batch = list(setup)
+        for index, request in enumerate(self._iter_cell_requests(sheet_id, df)):
+            if index:
+                yield batch
+                batch = []
+            batch.append(request)
+        yield batch + self._build_format_requests(sheet_id, df)
+    
+    @staticmethod
+    def _iter_chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """Yield (start_row, slice) pairs covering the frame in chunk_rows steps."""
+        for start in range(0, len(df), chunk_rows):
+            yield start, df.iloc[start:start + chunk_rows]
+    
+    @staticmethod
+    def _column_values(series: pd.Series) -> Tuple[List[Any], Callable[[Any], Dict[str, Any]]]:
+        """Materialize a column as native Python values with a formatter picked from its dtype."""
+        # NumPy-backed columns are read in place; only nullable extension columns are converted,
+        # and only float columns pay for a NaN check per cell
+        dtype = series.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            if series.dt.tz is not None:
+                series = series.dt.tz_localize(None)
+            series = (series - SHEETS_EPOCH) / pd.Timedelta(days=1)
+            return series.to_numpy(copy=False).tolist(), _number_value
+        if isinstance(dtype, np.dtype):
+            if dtype.kind == 'b':
+                return series.to_numpy(copy=False).tolist(), _bool_value
+            if dtype.kind in 'iu':
+                return series.to_numpy(copy=False).tolist(), _integer_value
+            if dtype.kind == 'f':
+                return series.to_numpy(copy=False).tolist(), _number_value
+        elif pd.api.types.is_bool_dtype(dtype):
+            return series.to_numpy(dtype=object, na_value=None).tolist(), _bool_value
+        elif pd.api.types.is_numeric_dtype(dtype):
+            return series.to_numpy(dtype='float64', na_value=np.nan).tolist(), _number_value
+        elif pd.api.types.is_string_dtype(dtype):
+            return series.to_numpy(dtype=object, na_value=None).tolist(), _string_value
+        return series.to_numpy(dtype=object, copy=False).tolist(), _cell_value
+    
+    def _iter_cell_requests(self, sheet_id: int, df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        """Yield updateCells requests writing the header and data, chunked by cell count."""
+        header = [{"userEnteredValue": {"stringValue": str(name)}} for name in df.columns]
+        # One row of headroom so the header fits in the first request too
+        chunk_rows = max(1, MAX_CELLS_PER_REQUEST // max(1, len(df.columns)) - 1)
+        
+        # Only one chunk's cell data is alive at a time; the header leads the first chunk
+        for start, chunk in self._iter_chunks(df, chunk_rows):
+            rows = [{"values": header}] if start == 0 else []
+            columns, formatters = zip(*(self._column_values(series) for _, series in chunk.items()))
+            rows.extend(
+                {"values": [format_value(value) for format_value, value in zip(formatters, row)]}
+                for row in zip(*columns)
+            )
+            yield {
+                "updateCells": {
+                    "range": {
+                        "sheetId": sheet_id,
+                        "startRowIndex": start + 1 if start else 0,
+                        "startColumnIndex": 0
+                    },
+                    "rows": rows,
+                    "fields": "userEnteredValue"
+                }
+            }
+    
+    def _build_format_requests(self, sheet_id: int, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Build header, date/currency and column-width formatting requests."""
+        requests = []
+        
+        # Bold header row
+        requests.append({
+            "repeatCell": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "startRowIndex": 0,
+                    "endRowIndex": 1,
+                    "startColumnIndex": 0,
+                    "endColumnIndex": len(df.columns)
+                },
+                "cell": {
+                    "userEnteredFormat": {
+                        "textFormat": {
+                            "bold": True
+                        }
+                    }
+                },
+                "fields": "userEnteredFormat.textFormat.bold"
+            }
+        })
+        
+        # Format Date column (assuming first column or column named 'Date')
+        date_col_index = None
         try:
-            sheet_id = worksheet.id
-            requests = []
-            
-            # Freeze header row
+            date_col_index = df.columns.get_loc('Date')
+        except KeyError:
+            if len(df.columns) > 0:
+                # Assume first column is date
+                date_col_index = 0
+        
+        try:
+            amount_col_index = df.columns.get_loc('Amount')
+        except KeyError:
+            amount_col_index = None
+        
+        # The first-column fallback must not stack a date format on top of the Amount column
+        if date_col_index is not None and date_col_index != amount_col_index:
             requests.append({
-                "updateSheetProperties": {
-                    "properties": {
+                "repeatCell": {
+                    "range": {
                         "sheetId": sheet_id,
-                        "gridProperties": {
-                            "frozenRowCount": 1
+                        "startRowIndex": 1,
+                        "endRowIndex": len(df) + 1,
+                        "startColumnIndex": date_col_index,
+                        "endColumnIndex": date_col_index + 1
+                    },
+                    "cell": {
+                        "userEnteredFormat": {
+                            "numberFormat": {
+                                "type": "DATE",
+                                "pattern": "yyyy-mm-dd"
+                            }
                         }
                     },
-                    "fields": "gridProperties.frozenRowCount"
+                    "fields": "userEnteredFormat.numberFormat"
                 }
             })
-            
-            # Bold header row
+        
+        # Format Amount column (assuming column named 'Amount')
+        if amount_col_index is not None:
             requests.append({
                 "repeatCell": {
                     "range": {
                         "sheetId": sheet_id,
-                        "startRowIndex": 0,
-                        "endRowIndex": 1,
-                        "startColumnIndex": 0,
-                        "endColumnIndex": len(df.columns)
+                        "startRowIndex": 1,
+                        "endRowIndex": len(df) + 1,
+                        "startColumnIndex": amount_col_index,
+                        "endColumnIndex": amount_col_index + 1
                     },
                     "cell": {
                         "userEnteredFormat": {
-                            "textFormat": {
-                                "bold": True
+                            "numberFormat": {
+                                "type": "CURRENCY",
+                                "pattern": "$#,##0.00"
                             }
                         }
                     },
-                    "fields": "userEnteredFormat.textFormat.bold"
+                    "fields": "userEnteredFormat.numberFormat"
                 }
             })
-            
-            # Format Date column (assuming first column or column named 'Date')
-            date_col_index = None
-            if 'Date' in df.columns:
-                date_col_index = list(df.columns).index('Date')
-            elif len(df.columns) > 0:
-                # Assume first column is date
-                date_col_index = 0
-            
-            if date_col_index is not None:
-                requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": sheet_id,
-                            "startRowIndex": 1,
-                            "endRowIndex": len(df) + 1,
-                            "startColumnIndex": date_col_index,
-                            "endColumnIndex": date_col_index + 1
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "numberFormat": {
-                                    "type": "DATE",
-                                    "pattern": "yyyy-mm-dd"
-                                }
-                            }
-                        },
-                        "fields": "userEnteredFormat.numberFormat"
-                    }
-                })
-            
-            # Format Amount column (assuming column named 'Amount')
-            amount_col_index = None
-            if 'Amount' in df.columns:
-                amount_col_index = list(df.columns).index('Amount')
-            
-            if amount_col_index is not None:
-                requests.append({
-                    "repeatCell": {
-                        "range": {
-                            "sheetId": sheet_id,
-                            "startRowIndex": 1,
-                            "endRowIndex": len(df) + 1,
-                            "startColumnIndex": amount_col_index,
-                            "endColumnIndex": amount_col_index + 1
-                        },
-                        "cell": {
-                            "userEnteredFormat": {
-                                "numberFormat": {
-                                    "type": "CURRENCY",
-                                    "pattern": "$#,##0.00"
-                                }
-                            }
-                        },
-                        "fields": "userEnteredFormat.numberFormat"
-                    }
-                })
-            
-            # Auto-resize columns
-            requests.append({
-                "autoResizeDimensions": {
-                    "dimensions": {
-                        "sheetId": sheet_id,
-                        "dimension": "COLUMNS",
-                        "startIndex": 0,
-                        "endIndex": len(df.columns)
-                    }
+        
+        # Auto-resize columns
+        requests.append({
+            "autoResizeDimensions": {
+                "dimensions": {
+                    "sheetId": sheet_id,
+                    "dimension": "COLUMNS",
+                    "startIndex": 0,
+                    "endIndex": len(df.columns)
                 }
-            })
-            
-            # Execute all formatting requests
-            if requests:
-                self.sheets_service.spreadsheets().batchUpdate(
-                    spreadsheetId=spreadsheet_id,
-                    body={"requests": requests}
-                ).execute()
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-                
-        except Exception as e:
-            print(f"Warning: Could not apply formatting: {e}")
+            }
+        })
+        
+        return requests
     
     def upload_multiple_sheets(self, spreadsheet_id: str, datasets: Dict[str, pd.DataFrame],
                               overwrite: bool = True) -> Dict[str, bool]:
-        """Upload multiple DataFrames to different sheets."""
-        results = {}
+        """Upload multiple DataFrames to different sheets through batched HTTP requests."""
+        results = {sheet_name: False for sheet_name in datasets}
+        pending = {}
         
         for sheet_name, df in datasets.items():
             if df.empty:
-                print(f"Skipping empty dataset: {sheet_name}")
-                results[sheet_name] = False
+                logger.info("Skipping empty dataset: %s", sheet_name)
                 continue
-                
-            success = self.upload_dataframe_to_sheet(
-                spreadsheet_id, sheet_name, df, overwrite
-            )
-            results[sheet_name] = success
+            try:
+                batches = self._build_upload_batches(spreadsheet_id, sheet_name, df, overwrite)
+                # [remaining batches, batch to send, consecutive failed attempts of that batch]
+                pending[sheet_name] = [batches, next(batches), 0]
+            except Exception as e:
+                logger.error("Error uploading to sheet '%s': %s", sheet_name, e)
+        
+        # Each round sends the next batch of every sheet in one HTTP batch, keeping per-sheet order
+        batch_attempt = 0
+        while pending:
+            errors = {}
+            
+            def on_response(request_id, response, exception):
+                if exception is not None:
+                    errors[request_id] = exception
+            
+            batch = self.sheets_service.new_batch_http_request(callback=on_response)
+            for sheet_name, (_, requests, _) in pending.items():
+                batch.add(
+                    self.sheets_service.spreadsheets().batchUpdate(
+                        spreadsheetId=spreadsheet_id,
+                        body={"requests": requests}
+                    ),
+                    request_id=sheet_name
+                )
+            self._bucket.consume(len(pending))
+            try:
+                batch.execute()
+            except Exception as e:
+                # The batch request itself failed, so no sheet in this round was written
+                delay = _retry_delay(e, batch_attempt)
+                if delay is None:
+                    for sheet_name in pending:
+                        logger.error("Error uploading to sheet '%s': %s", sheet_name, e)
+                    break
+                batch_attempt += 1
+                time.sleep(delay)
+                continue
+            batch_attempt = 0
+            self._invalidate_metadata(spreadsheet_id)
+            
+            delays = []
+            for sheet_name in list(pending):
+                error = errors.get(sheet_name)
+                if error is None:
+                    # Build the sheet's next batch only once the previous one is sent
+                    try:
+                        requests = next(pending[sheet_name][0], None)
+                    except Exception as e:
+                        logger.error("Error uploading to sheet '%s': %s", sheet_name, e)
+                        del pending[sheet_name]
+                        continue
+                    if requests is not None:
+                        pending[sheet_name][1:] = [requests, 0]
+                    else:
+                        del pending[sheet_name]
+                        results[sheet_name] = True
+                        logger.info("Uploaded %s rows to '%s' in spreadsheet %s", len(datasets[sheet_name]), sheet_name, spreadsheet_id)
+                else:
+                    delay = _retry_delay(error, pending[sheet_name][2])
+                    if delay is None:
+                        logger.error("Error uploading to sheet '%s': %s", sheet_name, error)
+                        del pending[sheet_name]
+                    else:
+                        pending[sheet_name][2] += 1
+                        delays.append(delay)
             
-            # Small delay between uploads to avoid rate limiting
-            time.sleep(0.5)
+            if delays:
+                # Back off before resending throttled or failed sheets
+                time.sleep(max(delays))
         
         return results
     
@@ -317,7 +795,7 @@ class SheetsManager:
         """Add links from filtered sheets back to Master sheet."""
         # This is handled by the 'Source' column added in data_cleaner.py
         # The formulas are automatically interpreted by Google Sheets
-        print("Master-to-filtered links are automatically handled via 'Source' column formulas.")
+        logger.info("Master-to-filtered links are automatically handled via 'Source' column formulas.")
     
     def get_spreadsheet_url(self, spreadsheet_id: str) -> str:
         """Get the web URL for the spreadsheet."""
@@ -361,6 +839,7 @@ def interactive_spreadsheet_selection(sheets_manager: SheetsManager) -> Tuple[st
     elif choice == "4":
         print("\nRecent spreadsheets:")
         recent = sheets_manager.list_user_spreadsheets(10)
+        last_used_id = _last_used_spreadsheet_id(_account_key(sheets_manager.creds))
         if not recent:
             print("No spreadsheets found. Creating new one.")
             title = input("New spreadsheet title: ").strip() or "Banking Transactions"
@@ -369,7 +848,8 @@ def interactive_spreadsheet_selection(sheets_manager: SheetsManager) -> Tuple[st
         
         for i, sheet in enumerate(recent, 1):
             modified = sheet.get('modifiedTime', 'Unknown')
-            print(f"  {i}) {sheet['name']} (Modified: {modified[:10]})")
+            marker = " [last used]" if sheet['id'] == last_used_id else ""
+            print(f"  {i}) {sheet['name']} (Modified: {modified[:10]}){marker}")
         
         try:
             idx = int(input(f"Select spreadsheet (1-{len(recent)}) or 0 for new: ").strip())
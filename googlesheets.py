@@ -1,8 +1,7 @@
 import pandas as pd
-import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-from pydrive2.auth import GoogleAuth
-from pydrive2.drive import GoogleDrive
+from googleapiclient.discovery import build
+from googleapiclient.http import MediaFileUpload
 
 # === SETUP AUTH ===
 scope = [
@@ -11,26 +10,60 @@ scope = [
 ]
 
 creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-client = gspread.authorize(creds)
+sheets_service = build("sheets", "v4", credentials=creds)
+drive_service = build("drive", "v3", credentials=creds)
 
-# Also auth for Google Drive
-gauth = GoogleAuth()
-gauth.credentials = creds
-drive = GoogleDrive(gauth)
+# Cells per values.batchUpdate request, keeping payloads well under the request size limit
+MAX_CELLS_PER_REQUEST = 50_000
 
 # === STEP 1: Load CSV ===
-df = pd.read_csv("transactions.csv")
-df = df[["Date", "Description", "Amount", "Category"]]  # simplified
+# Parse only the columns we push, with their types fixed up front
+df = pd.read_csv(
+    "transactions.csv",
+    usecols=["Date", "Description", "Amount", "Category"],
+    dtype={"Description": "string", "Category": "category", "Amount": "float64"},
+    parse_dates=["Date"],
+)
 
 # === STEP 2: Push to Google Sheets ===
-sheet = client.open("My Transactions").sheet1
-sheet.clear()
-sheet.update([df.columns.values.tolist()] + df.values.tolist())
+rows = df.assign(Date=df["Date"].dt.strftime("%Y-%m-%d")).astype(object).fillna("").values.tolist()
+
+found = drive_service.files().list(
+    q="name = 'My Transactions' and mimeType = 'application/vnd.google-apps.spreadsheet' and trashed = false",
+    pageSize=1,
+    fields="files(id)"
+).execute()["files"]
+if not found:
+    raise SystemExit("Spreadsheet 'My Transactions' not found")
+spreadsheet_id = found[0]["id"]
+first_sheet = sheets_service.spreadsheets().get(
+    spreadsheetId=spreadsheet_id,
+    fields="sheets.properties.title"
+).execute()["sheets"][0]["properties"]["title"]
+
+sheets_service.spreadsheets().values().clear(spreadsheetId=spreadsheet_id, range=f"'{first_sheet}'").execute()
+
+# One bulk request per row chunk, with the header riding in the first; one row of headroom keeps
+# that first request within the cell limit
+rows_per_chunk = max(1, MAX_CELLS_PER_REQUEST // max(1, len(df.columns)) - 1)
+for start in range(0, max(1, len(rows)), rows_per_chunk):
+    data = [{"range": f"'{first_sheet}'!A1", "values": [df.columns.tolist()]}] if start == 0 else []
+    chunk = rows[start:start + rows_per_chunk]
+    if chunk:
+        data.append({"range": f"'{first_sheet}'!A{start + 2}", "values": chunk})
+    sheets_service.spreadsheets().values().batchUpdate(
+        spreadsheetId=spreadsheet_id,
+        body={"valueInputOption": "USER_ENTERED", "data": data}
+    ).execute()
 
 print("✅ Data pushed to Google Sheets")
 
 # === STEP 3: Upload CSV backup to Drive ===
-file = drive.CreateFile({"title": "transactions_cleaned.csv", "mimeType": "text/csv"})
-file.SetContentFile("transactions.csv")
-file.Upload()
+# Resumable upload in 5MB chunks so large exports don't need one giant request
+media = MediaFileUpload("transactions.csv", mimetype="text/csv", resumable=True, chunksize=5 * 1024 * 1024)
+drive_service.files().create(
+    body={"name": "transactions_cleaned.csv", "mimeType": "text/csv"},
+    media_body=media,
+    fields="id"
+).execute()
 print("✅ CSV uploaded to Google Drive")